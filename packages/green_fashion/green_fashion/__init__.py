@@ -7,7 +7,16 @@ including color extraction, database management, and clothing classification.
 
 __version__ = "0.1.0"
 
-# Make key classes easily importable
-from .database import DataLoader, MongoDBManager
-
 __all__ = ["MongoDBManager", "DataLoader"]
+
+
+def __getattr__(name):
+    # Make key classes easily importable without importing the database
+    # drivers until one of them is actually used
+    if name in __all__:
+        from . import database
+
+        value = getattr(database, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
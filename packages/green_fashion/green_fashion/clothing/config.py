@@ -1,47 +1,58 @@
-CLOTHING_CATEGORIES_MAP = {
-    1: "Outerwear",
-    2: "Tops & t-shirts",
-    3: "Suits & blazers",
-    4: "Jumpers & sweaters",
-    5: "Trousers",
-    6: "Shorts",
-    7: "Socks & underwear",
-    8: "Sleepwear",
-    9: "Activewear",
-    10: "Other men's clothing",
-}
+from types import MappingProxyType
 
-SHOES_MAP = {
-    1: "Boots",
-    2: "Clogs & mules",
-    3: "Espadrilles",
-    4: "Flip-flops & slides",
-    5: "Formal shoes",
-    6: "Sandals",
-    7: "Slippers",
-    8: "Sports shoes",
-    9: "Trainers",
-    10: "Boat shoes, loafers & moccasins",
-}
+# Read-only category tables, shared safely across threads and requests
+CLOTHING_CATEGORIES_MAP = MappingProxyType(
+    {
+        1: "Outerwear",
+        2: "Tops & t-shirts",
+        3: "Suits & blazers",
+        4: "Jumpers & sweaters",
+        5: "Trousers",
+        6: "Shorts",
+        7: "Socks & underwear",
+        8: "Sleepwear",
+        9: "Activewear",
+        10: "Other men's clothing",
+    }
+)
 
-ACCESSORIES_MAP = {
-    1: "Bags & backpacks",
-    2: "Bandanas & headscarves",
-    3: "Belts",
-    4: "Braces & suspenders",
-    5: "Gloves",
-    6: "Handkerchiefs",
-    7: "Hats & caps",
-    8: "Jewellery",
-    9: "Pocket squares",
-    10: "Scarves & shawls",
-    11: "Sunglasses",
-    12: "Ties & bow ties",
-    13: "Watches",
-    14: "Other accessories",
-}
+SHOES_MAP = MappingProxyType(
+    {
+        1: "Boots",
+        2: "Clogs & mules",
+        3: "Espadrilles",
+        4: "Flip-flops & slides",
+        5: "Formal shoes",
+        6: "Sandals",
+        7: "Slippers",
+        8: "Sports shoes",
+        9: "Trainers",
+        10: "Boat shoes, loafers & moccasins",
+    }
+)
 
-WARDROBE_CATEGORIES_MAP = {1: "Clothing", 2: "Shoes", 3: "Accessories"}
-CLOTHING_CATEGORIES = list(CLOTHING_CATEGORIES_MAP.values())
-SHOES = list(SHOES_MAP.values())
-ACCESSORIES = list(ACCESSORIES_MAP.values())
+ACCESSORIES_MAP = MappingProxyType(
+    {
+        1: "Bags & backpacks",
+        2: "Bandanas & headscarves",
+        3: "Belts",
+        4: "Braces & suspenders",
+        5: "Gloves",
+        6: "Handkerchiefs",
+        7: "Hats & caps",
+        8: "Jewellery",
+        9: "Pocket squares",
+        10: "Scarves & shawls",
+        11: "Sunglasses",
+        12: "Ties & bow ties",
+        13: "Watches",
+        14: "Other accessories",
+    }
+)
+
+WARDROBE_CATEGORIES_MAP = MappingProxyType(
+    {1: "Clothing", 2: "Shoes", 3: "Accessories"}
+)
+CLOTHING_CATEGORIES = tuple(CLOTHING_CATEGORIES_MAP.values())
+SHOES = tuple(SHOES_MAP.values())
+ACCESSORIES = tuple(ACCESSORIES_MAP.values())
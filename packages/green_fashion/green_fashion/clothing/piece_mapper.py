@@ -1,3 +1,5 @@
+from types import MappingProxyType
+
 # head = 0
 # upper body = 1
 # lower body = 2
@@ -5,24 +7,29 @@
 # Shoes = 4
 # Accessories = 5
 
-mapper = {
-    "dress": 3,
-    "hat": 0,
-    "longsleeve": 1,
-    "outwear": 1,
-    "pants": 2,
-    "shirt": 1,
-    "shoes": 4,
-    "shorts": 2,
-    "skirt": 2,
-    "t-shirt": 1,
-}
+# Read-only lookup tables; keys are already lowercase
+mapper = MappingProxyType(
+    {
+        "dress": 3,
+        "hat": 0,
+        "longsleeve": 1,
+        "outwear": 1,
+        "pants": 2,
+        "shirt": 1,
+        "shoes": 4,
+        "shorts": 2,
+        "skirt": 2,
+        "t-shirt": 1,
+    }
+)
 
-section_to_name = {
-    0: "Head",
-    1: "Upper Body",
-    2: "Lower Body",
-    3: "Full Body",
-    4: "Shoes",
-    # 5: "Accessories",
-}
+section_to_name = MappingProxyType(
+    {
+        0: "Head",
+        1: "Upper Body",
+        2: "Lower Body",
+        3: "Full Body",
+        4: "Shoes",
+        # 5: "Accessories",
+    }
+)
@@ -1,59 +1,77 @@
-import io
-from collections import Counter
+from functools import lru_cache
 
 import numpy as np
+from loguru import logger
 from PIL import Image
-from rembg import remove
 
+# Smaller U2-Net variant; plenty for finding the garment mask
+REMBG_MODEL_NAME = "u2netp"
 
-def extract_color_palette(_image_path, resize_width=150, alpha_threshold=128):
-    image = Image.open(_image_path)
-    image = remove_background(image)
 
-    if image.mode != "RGBA":
-        image = image.convert("RGBA")
+@lru_cache(maxsize=1)
+def _get_rembg_session():
+    """Load the segmentation model once and reuse it for every image."""
+    # Lazy import rembg; it loads onnxruntime, which is slow to import
+    from rembg import new_session
+
+    return new_session(REMBG_MODEL_NAME)
+
+
+def extract_color_palette(
+    _image_path, resize_width=150, alpha_threshold=128, n_colors=8
+):
+    image = Image.open(_image_path)
 
+    # Downscale before background removal; segmentation cost grows with the
+    # pixel count and the palette only needs a small image
     original_width, original_height = image.size
     aspect_ratio = original_height / original_width
     resize_height = int(resize_width * aspect_ratio)
-    image = image.resize((resize_width, resize_height), Image.Resampling.LANCZOS)
+    image = image.resize((resize_width, resize_height), Image.Resampling.BILINEAR)
 
-    pixels_rgba = np.array(image).reshape(-1, 4)
+    image = remove_background(image)
+
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+
+    arr = np.asarray(image)
+    alpha = arr[..., 3].ravel()
+    rgb = arr[..., :3].reshape(-1, 3)
 
     # Getting the correct htreshold
-    foreground_mask = pixels_rgba[:, 3] > alpha_threshold
+    foreground_mask = alpha > alpha_threshold
 
     if not np.any(foreground_mask):
-        print("Warning: No foreground pixels found. Lowering alpha threshold.")
-        foreground_mask = pixels_rgba[:, 3] > 64  # Fallback threshold
+        logger.warning("No foreground pixels found. Lowering alpha threshold.")
+        foreground_mask = alpha > 64  # Fallback threshold
 
     if not np.any(foreground_mask):
-        print(
-            "Warning: Still no foreground pixels found. Using all non-zero alpha pixels."
+        logger.warning(
+            "Still no foreground pixels found. Using all non-zero alpha pixels."
         )
-        foreground_mask = pixels_rgba[:, 3] > 0
+        foreground_mask = alpha > 0
 
-    pixels = pixels_rgba[foreground_mask][:, :3]
+    # Select foreground rows and drop the alpha channel in a single copy
+    pixels = np.compress(foreground_mask, rgb, axis=0)
 
     # Lazy import sklearn to avoid blocking application startup
-    from sklearn.cluster import AgglomerativeClustering
-    from sklearn.preprocessing import StandardScaler
-
-    scaler = StandardScaler()
-    pixels_scaled = scaler.fit_transform(pixels)
+    from sklearn.cluster import MiniBatchKMeans
 
-    clustering = AgglomerativeClustering(
-        n_clusters=None, distance_threshold=100, linkage="ward"
+    clustering = MiniBatchKMeans(
+        n_clusters=min(n_colors, len(pixels)),
+        n_init=3,
+        batch_size=1024,
+        random_state=0,
     )
-    labels = clustering.fit_predict(pixels_scaled)
+    # RGB channels share the same 0-255 scale, so cluster them as-is
+    labels = clustering.fit_predict(pixels.astype(np.float32))
 
-    unique_labels = np.unique(labels)
-    colors = np.array(
-        [pixels[labels == label].mean(axis=0) for label in unique_labels]
-    ).astype(int)
-
-    color_counts = Counter(labels)
-    color_percentages = [(count / len(labels)) * 100 for count in color_counts.values()]
+    # Cluster centers are already the mean color of their pixels
+    counts = np.bincount(labels, minlength=clustering.n_clusters)
+    colors = clustering.cluster_centers_.astype(int)
+    nonempty = counts > 0
+    counts, colors = counts[nonempty], colors[nonempty]
+    color_percentages = (counts / counts.sum() * 100).tolist()
 
     palette = list(zip(colors, color_percentages))
     palette.sort(key=lambda x: x[1], reverse=True)
@@ -62,14 +80,10 @@ def extract_color_palette(_image_path, resize_width=150, alpha_threshold=128):
 
 
 def remove_background(image: Image.Image) -> Image.Image:
-    # Convert PIL image to bytes
-    img_byte_arr = io.BytesIO()
-    image.save(img_byte_arr, format="PNG")
-    img_byte_arr = img_byte_arr.getvalue()
-
-    # Remove background and return as PIL Image
-    result = remove(img_byte_arr)
-    return Image.open(io.BytesIO(result))
+    from rembg import remove
+
+    # rembg takes and returns PIL images directly, no PNG round-trip needed
+    return remove(image, session=_get_rembg_session())
 
 
 # def plot_palette(palette, selected_indices=None):
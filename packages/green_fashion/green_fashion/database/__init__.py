@@ -21,8 +21,23 @@ Usage:
         results = sql_conn.execute_query("SELECT * FROM items")
 """
 
-from .data_loader import DataLoader
-from .mongodb_manager import MongoDBManager
-from .sql_connector import get_async_sql_connector
+from importlib import import_module
+
+# Public name -> submodule defining it; imported on first attribute access so
+# using MongoDB does not pull in SQLAlchemy (and vice versa)
+_LAZY_ATTRS = {
+    "MongoDBManager": ".mongodb_manager",
+    "DataLoader": ".data_loader",
+    "get_async_sql_connector": ".sql_connector",
+}
 
 __all__ = ["MongoDBManager", "DataLoader", "get_async_sql_connector"]
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -35,8 +35,14 @@ CLOTHING_CATEGORIES = [
     "other",
 ]
 
-# Body sections mapping
-BODY_SECTIONS = {0: "Head", 1: "Upper Body", 2: "Lower Body", 3: "Feet"}
+# Body sections mapping (same numbering as clothing.piece_mapper)
+BODY_SECTIONS = {
+    0: "Head",
+    1: "Upper Body",
+    2: "Lower Body",
+    3: "Full Body",
+    4: "Shoes",
+}
 
 # Environment variables that should be set for GCS integration:
 # GCS_CREDENTIALS_PATH - Path to service account JSON file
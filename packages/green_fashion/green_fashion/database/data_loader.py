@@ -6,11 +6,37 @@ including the parsed dataset JSON file and other data formats.
 """
 
 import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
+from loguru import logger
+
+from ..clothing.piece_mapper import mapper
 from .config import DATASET_PATH
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None
+
+# JSONDecodeError subclasses ValueError for both parsers
+_loads = getattr(orjson, "loads", json.loads)
+
+# Body section inferred from category, shared with the dataset parser
+_CATEGORY_TO_SECTION = mapper
+_DEFAULT_SECTION = 1  # Upper Body
+
+# Fields every dataset item must have
+_REQUIRED_FIELDS = frozenset(("category",))
+
+
+@lru_cache(maxsize=4)
+def _load_json_cached(path: str, mtime_ns: int):
+    """Parse a JSON file once per modification time."""
+    with open(path, "rb") as f:
+        return _loads(f.read())
+
 
 class DataLoader:
     """
@@ -25,6 +51,10 @@ class DataLoader:
         """
         Load items from the parsed dataset JSON file.
 
+        The parsed file is cached until its modification time changes. Each
+        call returns fresh top-level item dicts; nested values are shared
+        with the cache and must not be mutated.
+
         Args:
             dataset_path: Path to the dataset file (optional)
 
@@ -33,18 +63,48 @@ class DataLoader:
         """
         path = dataset_path or DATASET_PATH
         try:
-            with open(path, "r") as f:
-                return json.load(f)
+            items = _load_json_cached(str(path), Path(path).stat().st_mtime_ns)
+            return [dict(item) for item in items]
         except FileNotFoundError:
-            print(f"Dataset file not found at: {path}")
+            logger.warning("Dataset file not found at: {path}", path=str(path))
             return []
-        except json.JSONDecodeError as e:
-            print(f"Error parsing JSON file: {str(e)}")
+        except ValueError as e:
+            logger.error("Error parsing JSON file: {error}", error=str(e))
             return []
         except Exception as e:
-            print(f"Error loading dataset: {str(e)}")
+            logger.exception("Error loading dataset: {error}", error=str(e))
             return []
 
+    @classmethod
+    def iter_dataset_items(cls, dataset_path: Optional[Path] = None) -> Iterator[Dict]:
+        """
+        Iterate over items from the dataset file one at a time.
+
+        JSON Lines files (``.jsonl``) are streamed line by line so only one
+        item is held in memory at a time. Regular JSON array files are parsed
+        in full and then yielded item by item.
+
+        Args:
+            dataset_path: Path to the dataset file (optional)
+
+        Yields:
+            Dict: Clothing items from the dataset
+        """
+        path = Path(dataset_path or DATASET_PATH)
+        if path.suffix != ".jsonl":
+            yield from cls.load_dataset_items(path)
+            return
+
+        try:
+            with open(path, "rb") as f:
+                for line in f:
+                    if line.strip():
+                        yield _loads(line)
+        except FileNotFoundError:
+            logger.warning("Dataset file not found at: {path}", path=str(path))
+        except ValueError as e:
+            logger.error("Error parsing JSON Lines file: {error}", error=str(e))
+
     @staticmethod
     def load_json_file(file_path: Path) -> Optional[Dict]:
         """
@@ -57,10 +117,14 @@ class DataLoader:
             Dict: Loaded data or None if failed
         """
         try:
-            with open(file_path, "r") as f:
-                return json.load(f)
+            with open(file_path, "rb") as f:
+                return _loads(f.read())
         except Exception as e:
-            print(f"Error loading JSON file {file_path}: {str(e)}")
+            logger.exception(
+                "Error loading JSON file {path}: {error}",
+                path=str(file_path),
+                error=str(e),
+            )
             return None
 
     @staticmethod
@@ -79,11 +143,25 @@ class DataLoader:
             # Ensure parent directory exists
             file_path.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(file_path, "w") as f:
-                json.dump(data, f, indent=2, default=str)
+            if orjson is not None:
+                with open(file_path, "wb") as f:
+                    f.write(
+                        orjson.dumps(
+                            data,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+                            default=str,
+                        )
+                    )
+            else:
+                with open(file_path, "w") as f:
+                    json.dump(data, f, indent=2, default=str)
             return True
         except Exception as e:
-            print(f"Error saving JSON file {file_path}: {str(e)}")
+            logger.exception(
+                "Error saving JSON file {path}: {error}",
+                path=str(file_path),
+                error=str(e),
+            )
             return False
 
     @staticmethod
@@ -97,7 +175,6 @@ class DataLoader:
         Returns:
             bool: True if valid, False otherwise
         """
-        required_fields = ["category"]
         # optional_fields = [
         #     "custom_name",
         #     "display_name",
@@ -106,53 +183,57 @@ class DataLoader:
         #     "path",
         #     "notes",
         # ]
-
-        # Check required fields
-        for field in required_fields:
-            if field not in item:
-                return False
-
-        return True
+        return _REQUIRED_FIELDS.issubset(item)
 
     @staticmethod
-    def clean_item_data(item: Dict) -> Dict:
+    def clean_item_data(item: Dict, copy: bool = True) -> Dict:
         """
         Clean and standardize item data.
 
         Args:
             item: Raw item data
+            copy: Clean a copy of the item; pass False to fill in the
+                defaults on ``item`` itself when nothing else holds it
 
         Returns:
             Dict: Cleaned item data
         """
-        cleaned = item.copy()
+        cleaned = item.copy() if copy else item
 
         # Ensure required fields have default values
-        if "custom_name" not in cleaned and "display_name" in cleaned:
-            cleaned["custom_name"] = cleaned["display_name"]
-
-        if "custom_name" not in cleaned:
-            cleaned["custom_name"] = "Unnamed Item"
-
-        if "colors" not in cleaned:
-            cleaned["colors"] = []
+        cleaned.setdefault("custom_name", cleaned.get("display_name", "Unnamed Item"))
+        cleaned.setdefault("colors", [])
 
         if "body_section" not in cleaned:
-            # Try to infer from category
+            # Infer from category
             category = cleaned.get("category", "").lower()
-            if category in ["hat"]:
-                cleaned["body_section"] = 0  # Head
-            elif category in ["shirt", "t-shirt", "longsleeve", "dress", "outwear"]:
-                cleaned["body_section"] = 1  # Upper Body
-            elif category in ["pants", "shorts", "skirt"]:
-                cleaned["body_section"] = 2  # Lower Body
-            elif category in ["shoes"]:
-                cleaned["body_section"] = 3  # Feet
-            else:
-                cleaned["body_section"] = 1  # Default to Upper Body
+            cleaned["body_section"] = _CATEGORY_TO_SECTION.get(
+                category, _DEFAULT_SECTION
+            )
 
         return cleaned
 
+    @classmethod
+    def iter_clean_items(cls, dataset_path: Optional[Path] = None) -> Iterator[Dict]:
+        """
+        Iterate over validated and cleaned dataset items.
+
+        Args:
+            dataset_path: Path to the dataset file (optional)
+
+        Yields:
+            Dict: Cleaned clothing items
+        """
+        for item in cls.iter_dataset_items(dataset_path):
+            if cls.validate_item_data(item):
+                # Items are freshly parsed and owned by this loop
+                yield cls.clean_item_data(item, copy=False)
+            else:
+                logger.debug(
+                    "Skipping invalid item: {name}",
+                    name=item.get("display_name", "Unknown"),
+                )
+
     @classmethod
     def load_and_clean_dataset(cls, dataset_path: Optional[Path] = None) -> List[Dict]:
         """
@@ -164,13 +245,4 @@ class DataLoader:
         Returns:
             List[Dict]: List of cleaned clothing items
         """
-        items = cls.load_dataset_items(dataset_path)
-        cleaned_items = []
-
-        for item in items:
-            if cls.validate_item_data(item):
-                cleaned_items.append(cls.clean_item_data(item))
-            else:
-                print(f"Skipping invalid item: {item.get('display_name', 'Unknown')}")
-
-        return cleaned_items
+        return list(cls.iter_clean_items(dataset_path))
@@ -1,9 +1,17 @@
+import re
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from bson import ObjectId
+from bson.codec_options import CodecOptions, TypeDecoder, TypeRegistry
+from bson.regex import Regex
 from loguru import logger
-from pymongo import MongoClient
+from pymongo import MongoClient, ReturnDocument
+from pymongo.errors import OperationFailure
 
 from .config import (
     CLOTHING_ITEMS_DB_NAME,
@@ -12,6 +20,138 @@ from .config import (
     WARDROBE_IMAGES_DIR,
 )
 
+# How long cached wardrobe statistics stay valid
+STATS_CACHE_TTL_SECONDS = 60
+# Upper bound on cached (statistic, user) entries per manager
+STATS_CACHE_MAX_ENTRIES = 10_000
+
+# Set once the wardrobe images directory has been created in this process
+_image_dir_ready = False
+
+# (mongodb_uri, database_name) pairs whose indexes were created in this process
+_indexed_databases = set()
+
+# Fields returned by the item read methods
+ITEM_PROJECTION = {
+    "custom_name": 1,
+    "wardrobe_category": 1,
+    "category": 1,
+    "notes": 1,
+    "colors": 1,
+    "display_name": 1,
+    "path": 1,
+    "user_id": 1,
+    "created_at": 1,
+    "updated_at": 1,
+}
+
+# Smaller field set for list views that don't show colors or notes
+ITEM_LIST_PROJECTION = {
+    "custom_name": 1,
+    "wardrobe_category": 1,
+    "category": 1,
+    "display_name": 1,
+    "path": 1,
+    "user_id": 1,
+    "created_at": 1,
+}
+
+# Documents fetched per round trip by the item read methods
+DEFAULT_BATCH_SIZE = 500
+
+# Queries containing these cannot be tokenized by the text index
+_REGEX_METACHARS = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+# Lowercased copy of custom_name; a case-sensitive anchored regex on it can
+# use the (user_id, field) index as a range scan, which "i" regexes cannot
+SEARCH_NAME_FIELD = "_search_name_lc"
+
+# Server error code for a $text query without a text index
+_INDEX_NOT_FOUND = 27
+
+
+def _set_search_fields(fields: Dict) -> Dict:
+    """Keep the lowercase search shadow in step with custom_name."""
+    custom_name = fields.get("custom_name")
+    if isinstance(custom_name, str):
+        fields[SEARCH_NAME_FIELD] = custom_name.lower()
+    return fields
+
+
+def _regex_search_conditions(query: str, anchored: bool) -> Dict:
+    """Case-insensitive regex filter over the search fields."""
+    # User input is escaped so it always matches literally
+    escaped = re.escape(query)
+    pattern = Regex(f"^{escaped}" if anchored else escaped, "i")
+    if anchored:
+        name_conditions = [
+            {SEARCH_NAME_FIELD: Regex(f"^{re.escape(query.lower())}")},
+            # Items written before the shadow field existed
+            {SEARCH_NAME_FIELD: {"$exists": False}, "custom_name": pattern},
+        ]
+    else:
+        name_conditions = [{"custom_name": pattern}]
+    return {
+        "$or": [
+            *name_conditions,
+            {"category": pattern},
+            {"display_name": pattern},
+        ]
+    }
+
+
+class _ObjectIdToStrDecoder(TypeDecoder):
+    """Decode ObjectIds to strings while BSON is parsed by the driver."""
+
+    bson_type = ObjectId
+
+    def transform_bson(self, value):
+        return str(value)
+
+
+# Item documents are returned to API clients, which expect string ids
+ITEM_CODEC_OPTIONS = CodecOptions(type_registry=TypeRegistry([_ObjectIdToStrDecoder()]))
+
+
+@lru_cache(maxsize=4096)
+def _oid(item_id: str) -> ObjectId:
+    """
+    Parse an item ID, reusing the ObjectId for recently seen IDs.
+
+    A request typically touches the same item several times (fetch, update,
+    delete); the cache is bounded to the 4096 most recent IDs. Invalid IDs
+    raise bson.errors.InvalidId and are not cached.
+    """
+    return ObjectId(item_id)
+
+
+@lru_cache(maxsize=8)
+def _get_client(mongodb_uri: Optional[str]) -> MongoClient:
+    """
+    Return the process-wide MongoClient for a connection string.
+
+    MongoClient is thread-safe and owns the connection pool and topology
+    monitor, so managers created for the same URI share a single client.
+    """
+    return MongoClient(
+        mongodb_uri,
+        appname="green-fashion",
+        # zlib ships with Python; zstd/snappy would need extra packages
+        compressors="zlib",
+        zlibCompressionLevel=3,
+        # Keep a warm pool for bursts of concurrent Cloud Run requests and
+        # fail fast instead of queueing when it is exhausted
+        maxPoolSize=200,
+        minPoolSize=10,
+        maxIdleTimeMS=300000,
+        waitQueueTimeoutMS=5000,
+        retryReads=True,
+        retryWrites=True,
+        serverSelectionTimeoutMS=15000,  # 15 second timeout for Cloud Run
+        connectTimeoutMS=15000,  # 15 second connection timeout
+        socketTimeoutMS=15000,  # 15 second socket timeout
+    )
+
 
 class MongoDBManager:
     """
@@ -40,30 +180,43 @@ class MongoDBManager:
         self.clothing_items_db = None
         self.user_db = None
         self.connection_error = None
+        # (name, user_id) -> (monotonic timestamp, value), least recently
+        # used first
+        self._cache: OrderedDict = OrderedDict()
+        # Endpoints call the manager from threadpool workers concurrently
+        self._cache_lock = threading.Lock()
+        # Bumped by every invalidation so a value computed before a write is
+        # not stored after it
+        self._cache_generation = 0
 
         self.connect_to_db()
         self.ensure_image_directory()
 
-    def connect_to_db(self) -> bool:
+    def connect_to_db(self, verify: bool = False) -> bool:
         """
         Establish connection to MongoDB.
 
+        The client connects lazily, so by default no round trip is made
+        here; connectivity is checked by the detailed health endpoint.
+
+        Args:
+            verify: Ping the server before returning
+
         Returns:
             bool: True if connection successful, False otherwise
         """
         try:
-            self.client = MongoClient(
-                self.mongodb_uri,
-                serverSelectionTimeoutMS=15000,  # 15 second timeout for Cloud Run
-                connectTimeoutMS=15000,  # 15 second connection timeout
-                socketTimeoutMS=15000,  # 15 second socket timeout
-            )
+            # The client connects lazily and validates on first operation
+            self.client = _get_client(self.mongodb_uri)
+            if verify:
+                self.client.admin.command("ping")
             self.db = self.client[self.database_name]
-            self.clothing_items_db = self.db[CLOTHING_ITEMS_DB_NAME]
+            self.clothing_items_db = self.db.get_collection(
+                CLOTHING_ITEMS_DB_NAME, codec_options=ITEM_CODEC_OPTIONS
+            )
             self.user_db = self.db[USER_DB_NAME]
 
-            # Test connection
-            self.client.server_info()
+            self.ensure_indexes()
             return True
         except Exception as e:
             logger.exception("Failed to connect to MongoDB: {error}", error=str(e))
@@ -75,17 +228,128 @@ class MongoDBManager:
             return False
 
     def close_connection(self):
-        """Close the MongoDB connection."""
-        if self.client:
-            self.client.close()
+        """
+        Release the MongoDB connection.
+
+        The client is shared with other managers for the same URI, so its
+        pool is left open; it is closed when the process exits.
+        """
+        self.client = None
+
+    def ensure_indexes(self):
+        """Create the indexes used by the query methods (idempotent).
+
+        Each index is created on its own, so one failure (e.g. a unique
+        index over existing duplicates) does not skip the others. The
+        database is only marked as indexed once every index exists, so
+        failures are retried by the next manager.
+        """
+        key = (self.mongodb_uri, self.database_name)
+        if key in _indexed_databases:
+            return
+
+        items = self.clothing_items_db
+        indexes = [
+            # Image paths are unique per user; items without an uploaded
+            # image are skipped
+            (
+                items,
+                [("user_id", 1), ("path", 1)],
+                {
+                    "unique": True,
+                    "partialFilterExpression": {"path": {"$type": "string"}},
+                },
+            ),
+            (items, "category", {}),
+            # One per regex search field, so every $or branch of a per-user
+            # regex search scans only that user's index keys
+            *(
+                (items, [("user_id", 1), (field, 1)], {})
+                for field in (
+                    "custom_name",
+                    "category",
+                    "display_name",
+                    SEARCH_NAME_FIELD,
+                )
+            ),
+            # Newest-first listing of a user's items for get_items_page
+            (items, [("user_id", 1), ("created_at", -1), ("_id", -1)], {}),
+            (
+                items,
+                [
+                    ("custom_name", "text"),
+                    ("category", "text"),
+                    ("display_name", "text"),
+                ],
+                {"name": "search_text"},
+            ),
+            (self.user_db, "google_id", {"unique": True}),
+        ]
+
+        all_created = True
+        for collection, keys, options in indexes:
+            try:
+                collection.create_index(keys, **options)
+            except Exception as e:
+                all_created = False
+                logger.warning(
+                    "Error creating index {keys} on {collection}: {error}",
+                    keys=str(keys),
+                    collection=collection.name,
+                    error=str(e),
+                )
+
+        if all_created:
+            _indexed_databases.add(key)
 
     def ensure_image_directory(self):
         """Ensure the wardrobe images directory exists."""
+        global _image_dir_ready
+        if _image_dir_ready:
+            return
         try:
             WARDROBE_IMAGES_DIR.mkdir(parents=True, exist_ok=True)
+            _image_dir_ready = True
         except Exception as e:
             logger.warning("Error creating image directory: {error}", error=str(e))
 
+    def _cached(
+        self, key: Tuple[str, Optional[str]], compute: Callable[[], Any]
+    ) -> Any:
+        """Return the cached value for key, recomputing it once it is stale.
+
+        The query runs outside the lock, so a slow aggregation does not
+        block cache hits for other users.
+        """
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            generation = self._cache_generation
+            if entry is not None and now - entry[0] < STATS_CACHE_TTL_SECONDS:
+                self._cache.move_to_end(key)
+                return entry[1]
+        value = compute()
+        with self._cache_lock:
+            if generation != self._cache_generation:
+                # A write happened while computing; the value may be stale
+                return value
+            self._cache[key] = (now, value)
+            self._cache.move_to_end(key)
+            if len(self._cache) > STATS_CACHE_MAX_ENTRIES:
+                # Evict the least recently used entry without iterating
+                self._cache.popitem(last=False)
+        return value
+
+    def _invalidate_cache(self, user_id: Optional[str] = None):
+        """Drop cached values for a user, or for everyone if no user is given."""
+        with self._cache_lock:
+            self._cache_generation += 1
+            if user_id is None:
+                self._cache.clear()
+                return
+            for key in [key for key in self._cache if key[1] in (user_id, None)]:
+                del self._cache[key]
+
     # CRUD Operations
 
     def add_clothing_item(self, item_data: Dict) -> Optional[str]:
@@ -99,35 +363,101 @@ class MongoDBManager:
             str: The inserted item's ID, or None if failed
         """
         try:
-            item_data["created_at"] = datetime.now()
-            item_data["updated_at"] = datetime.now()
-            if "user_id" in item_data:
-                item_data["user_id"] = item_data["user_id"]
+            now = datetime.utcnow()
+            item_data["created_at"] = item_data["updated_at"] = now
+            _set_search_fields(item_data)
             result = self.clothing_items_db.insert_one(item_data)
-            return str(result.inserted_id)
         except Exception as e:
             logger.exception("Error adding item: {error}", error=str(e))
             return None
+        # Outside the try so a cache problem cannot hide a successful write
+        self._invalidate_cache(item_data.get("user_id"))
+        return str(result.inserted_id)
+
+    def iter_items(
+        self,
+        user_id,
+        projection: Optional[Dict] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[Dict]:
+        """
+        Lazily iterate over a user's clothing items.
+
+        Documents are yielded as the cursor fetches each batch, so callers
+        can start processing before the whole result set has arrived. The
+        server-side cursor is closed as soon as iteration stops, even if the
+        caller abandons the generator early.
+
+        Args:
+            user_id: The user's ID
+            projection: Fields to return (defaults to ITEM_PROJECTION)
+            batch_size: Number of documents fetched per round trip
 
-    def get_all_items(self, user_id) -> List[Dict]:
+        Yields:
+            Dict: Clothing items
+        """
+        cursor = self.clothing_items_db.find(
+            {"user_id": user_id}, projection=projection or ITEM_PROJECTION
+        ).batch_size(batch_size)
+        try:
+            yield from cursor
+        finally:
+            cursor.close()
+
+    def get_all_items(
+        self,
+        user_id,
+        projection: Optional[Dict] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> List[Dict]:
         """
         Retrieve all clothing items from the database.
 
+        Args:
+            user_id: The user's ID
+            projection: Fields to return (defaults to ITEM_PROJECTION; use
+                ITEM_LIST_PROJECTION for lighter list views)
+            batch_size: Number of documents fetched per round trip
+
         Returns:
             List[Dict]: List of all clothing items
         """
         try:
-            items = list(self.clothing_items_db.find({"user_id": user_id}))
+            items = list(self.iter_items(user_id, projection, batch_size))
             logger.debug("Retrieved {count} items", count=len(items))
-            for item in items:
-                item["_id"] = str(item["_id"])
-                if "user_id" in item:
-                    item["user_id"] = str(item["user_id"])
             return items
         except Exception as e:
             logger.exception("Error fetching items: {error}", error=str(e))
             return []
 
+    def get_items_page(self, user_id, skip: int = 0, limit: int = 50) -> List[Dict]:
+        """
+        Retrieve one page of a user's clothing items, newest first.
+
+        Items are ordered by creation time with the ID as a tie-breaker, so
+        consecutive pages neither repeat nor skip items.
+
+        Args:
+            user_id: The user's ID
+            skip: Number of items to skip
+            limit: Maximum number of items to return
+
+        Returns:
+            List[Dict]: Clothing items on the requested page
+        """
+        try:
+            return list(
+                self.clothing_items_db.find(
+                    {"user_id": user_id}, projection=ITEM_PROJECTION
+                )
+                .sort([("created_at", -1), ("_id", -1)])
+                .skip(skip)
+                .limit(limit)
+            )
+        except Exception as e:
+            logger.exception("Error fetching items page: {error}", error=str(e))
+            return []
+
     def get_item_by_id(self, item_id: str, user_id: str = None) -> Optional[Dict]:
         """
         Retrieve a specific item by its ID.
@@ -140,15 +470,10 @@ class MongoDBManager:
             Dict: Item data or None if not found
         """
         try:
-            query = {"_id": ObjectId(item_id)}
+            query = {"_id": _oid(item_id)}
             if user_id:
                 query["user_id"] = user_id
-            item = self.clothing_items_db.find_one(query)
-            if item:
-                item["_id"] = str(item["_id"])
-                if "user_id" in item:
-                    item["user_id"] = str(item["user_id"])
-            return item
+            return self.clothing_items_db.find_one(query, projection=ITEM_PROJECTION)
         except Exception as e:
             logger.exception("Error fetching item: {error}", error=str(e))
             return None
@@ -166,15 +491,20 @@ class MongoDBManager:
             bool: True if update successful, False otherwise
         """
         try:
-            updates["updated_at"] = datetime.now()
-            query = {"_id": ObjectId(item_id)}
+            # The server stamps updated_at, so it must not also be in $set
+            updates.pop("updated_at", None)
+            query = {"_id": _oid(item_id)}
             if user_id:
                 query["user_id"] = user_id
-            result = self.clothing_items_db.update_one(query, {"$set": updates})
-            return result.modified_count > 0
+            update = {"$currentDate": {"updated_at": True}}
+            if updates:
+                update["$set"] = _set_search_fields(updates)
+            result = self.clothing_items_db.update_one(query, update)
         except Exception as e:
             logger.exception("Error updating item: {error}", error=str(e))
             return False
+        self._invalidate_cache(user_id)
+        return result.modified_count > 0
 
     def delete_item(self, item_id: str, user_id: str = None) -> bool:
         """
@@ -188,56 +518,99 @@ class MongoDBManager:
             bool: True if deletion successful, False otherwise
         """
         try:
-            query = {"_id": ObjectId(item_id)}
+            query = {"_id": _oid(item_id)}
             if user_id:
                 query["user_id"] = user_id
             result = self.clothing_items_db.delete_one(query)
-            return result.deleted_count > 0
         except Exception as e:
             logger.exception("Error deleting item: {error}", error=str(e))
             return False
+        self._invalidate_cache(user_id)
+        return result.deleted_count > 0
 
     # Search Operations
 
-    def search_items(self, query: str, user_id: str = None) -> List[Dict]:
+    def search_items(
+        self,
+        query: str,
+        user_id: str = None,
+        prefix: bool = False,
+        projection: Optional[Dict] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> List[Dict]:
         """
         Search for items based on name, category, or filename.
 
+        Word queries use the text index. Prefix searches, single characters
+        and queries with regex metacharacters use a case-insensitive regex
+        on each field, anchored to the start of the field for the first two
+        and matching anywhere otherwise. If the text index is missing, word
+        queries fall back to the unanchored regex search.
+
         Args:
             query: Search query string
             user_id: The user's ID (optional for backwards compatibility)
+            prefix: Match fields that start with the query (e.g. search-as-you-type)
+            projection: Fields to return (defaults to ITEM_PROJECTION)
+            batch_size: Number of documents fetched per round trip
 
         Returns:
             List[Dict]: List of matching items
         """
+        query = query.strip()
+        if not query:
+            return []
+
+        projection = projection or ITEM_PROJECTION
+        # Prefix searches and single characters are anchored to the start
+        anchored = prefix or len(query) < 2
         try:
-            search_conditions = {
-                "$or": [
-                    {"custom_name": {"$regex": query, "$options": "i"}},
-                    {"category": {"$regex": query, "$options": "i"}},
-                    {"display_name": {"$regex": query, "$options": "i"}},
-                ]
-            }
+            if not anchored and not _REGEX_METACHARS.search(query):
+                # Word queries go through the text index instead of a collection scan
+                search_conditions = {"$text": {"$search": query}}
+                if user_id:
+                    search_conditions["user_id"] = user_id
+                try:
+                    # Sorting on the text score without projecting it (MongoDB
+                    # 4.4+) keeps the relevance score out of the returned items
+                    cursor = self.clothing_items_db.find(
+                        search_conditions, projection=projection
+                    ).sort([("score", {"$meta": "textScore"})])
+                    return list(cursor.batch_size(batch_size))
+                except OperationFailure as e:
+                    if e.code != _INDEX_NOT_FOUND:
+                        raise
+                    logger.warning(
+                        "Text index missing, falling back to regex search: {error}",
+                        error=str(e),
+                    )
+
+            search_conditions = _regex_search_conditions(query, anchored)
             if user_id:
                 search_conditions["user_id"] = user_id
-
-            items = list(self.clothing_items_db.find(search_conditions))
-            for item in items:
-                item["_id"] = str(item["_id"])
-                if "user_id" in item:
-                    item["user_id"] = str(item["user_id"])
-            return items
+            cursor = self.clothing_items_db.find(
+                search_conditions, projection=projection
+            )
+            return list(cursor.batch_size(batch_size))
         except Exception as e:
             logger.exception("Error searching items: {error}", error=str(e))
             return []
 
-    def get_items_by_category(self, category: str, user_id: str = None) -> List[Dict]:
+    def get_items_by_category(
+        self,
+        category: str,
+        user_id: str = None,
+        projection: Optional[Dict] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> List[Dict]:
         """
         Get all items in a specific category.
 
         Args:
             category: Category name
             user_id: The user's ID (optional for backwards compatibility)
+            projection: Fields to return (defaults to ITEM_PROJECTION)
+            batch_size: Number of documents fetched per round trip
 
         Returns:
             List[Dict]: List of items in the category
@@ -246,12 +619,11 @@ class MongoDBManager:
             query = {"category": category}
             if user_id:
                 query["user_id"] = user_id
-            items = list(self.clothing_items_db.find(query))
-            for item in items:
-                item["_id"] = str(item["_id"])
-                if "user_id" in item:
-                    item["user_id"] = str(item["user_id"])
-            return items
+            return list(
+                self.clothing_items_db.find(
+                    query, projection=projection or ITEM_PROJECTION
+                ).batch_size(batch_size)
+            )
         except Exception as e:
             logger.exception("Error fetching items by category: {error}", error=str(e))
             return []
@@ -260,95 +632,125 @@ class MongoDBManager:
         """
         Get all unique categories in the database.
 
+        Served from get_stats, so a dashboard asking for categories, counts
+        and the total shares one cached aggregation. Items without a category
+        are left out, as in the counts.
+
         Args:
             user_id: The user's ID (optional for backwards compatibility)
 
         Returns:
-            List[str]: List of unique categories
+            List[str]: List of unique categories, sorted
         """
-        try:
-            query = {}
-            if user_id:
-                query["user_id"] = user_id
-            return self.clothing_items_db.distinct("category", query)
-        except Exception as e:
-            logger.exception("Error fetching categories: {error}", error=str(e))
-            return []
+        return sorted(self.get_stats(user_id)["categories"])
 
     def get_item_count(self, user_id: str = None) -> int:
         """
         Get total number of items in the wardrobe.
 
+        Served from get_stats, like get_categories.
+
         Args:
             user_id: The user's ID (optional for backwards compatibility)
 
         Returns:
             int: Total item count
         """
-        try:
-            query = {}
-            if user_id:
-                query["user_id"] = user_id
-            return self.clothing_items_db.count_documents(query)
-        except Exception as e:
-            logger.exception("Error getting item count: {error}", error=str(e))
-            return 0
+        return self.get_stats(user_id)["total"]
 
     def get_category_counts(self, user_id: str = None) -> Dict[str, int]:
         """
         Get count of items per category.
 
+        Served from get_stats, like get_categories.
+
         Args:
             user_id: The user's ID (optional for backwards compatibility)
 
         Returns:
             Dict[str, int]: Category counts
         """
+        return dict(self.get_stats(user_id)["category_counts"])
+
+    def get_stats(self, user_id: str = None) -> Dict[str, Any]:
+        """
+        Get item count, categories and per-category counts in one query.
+
+        A single $facet aggregation replaces the separate count, distinct and
+        group queries. Results are cached per user for
+        STATS_CACHE_TTL_SECONDS and dropped whenever this manager writes.
+
+        Args:
+            user_id: The user's ID (optional for backwards compatibility)
+
+        Returns:
+            Dict[str, Any]: ``total``, ``categories`` and ``category_counts``
+        """
         try:
-            pipeline = []
-            if user_id:
-                pipeline.append({"$match": {"user_id": user_id}})
-            pipeline.extend(
-                [
-                    {"$group": {"_id": "$category", "count": {"$sum": 1}}},
-                    {"$sort": {"count": -1}},
-                ]
-            )
-            results = list(self.clothing_items_db.aggregate(pipeline))
-            return {result["_id"]: result["count"] for result in results}
+            return self._cached(("stats", user_id), lambda: self._query_stats(user_id))
         except Exception as e:
-            logger.exception("Error getting category counts: {error}", error=str(e))
-            return {}
+            logger.exception("Error getting stats: {error}", error=str(e))
+            return {"total": 0, "categories": [], "category_counts": {}}
+
+    def _query_stats(self, user_id: Optional[str]) -> Dict[str, Any]:
+        pipeline = []
+        if user_id:
+            pipeline.append({"$match": {"user_id": user_id}})
+        pipeline.append(
+            {
+                "$facet": {
+                    "total": [{"$count": "n"}],
+                    "by_category": [
+                        {"$match": {"category": {"$ne": None}}},
+                        {"$group": {"_id": "$category", "count": {"$sum": 1}}},
+                        {"$sort": {"count": -1}},
+                    ],
+                }
+            }
+        )
+        result = next(self.clothing_items_db.aggregate(pipeline))
+        category_counts = {
+            group["_id"]: group["count"] for group in result["by_category"]
+        }
+        return {
+            "total": result["total"][0]["n"] if result["total"] else 0,
+            "categories": list(category_counts),
+            "category_counts": category_counts,
+        }
 
     def create_or_get_user(self, google_user_data):
-        existing_user = self.user_db.find_one(
-            {"google_id": google_user_data["google_id"]}
-        )
+        """
+        Fetch the user for a Google account, creating it on first login.
 
-        if existing_user:
-            self.user_db.update_one(
-                {"_id": existing_user["_id"]},
-                {"$set": {"last_login": datetime.utcnow()}},
-            )
-            return existing_user
-
-        user_doc = {
-            "google_id": google_user_data["google_id"],
-            "email": google_user_data["email"],
-            "name": google_user_data["name"],
-            "picture": google_user_data.get("picture"),
-            "created_at": datetime.utcnow(),
-            "last_login": datetime.utcnow(),
-        }
+        A single upsert records the login and returns the stored user, so
+        every login costs one round trip.
 
-        result = self.user_db.insert_one(user_doc)
-        user_doc["_id"] = result.inserted_id
-        return user_doc
+        Args:
+            google_user_data: Dict with google_id, email, name and picture
+
+        Returns:
+            Dict: The user document
+        """
+        now = datetime.utcnow()
+        return self.user_db.find_one_and_update(
+            {"google_id": google_user_data["google_id"]},
+            {
+                "$set": {"last_login": now},
+                "$setOnInsert": {
+                    "email": google_user_data["email"],
+                    "name": google_user_data["name"],
+                    "picture": google_user_data.get("picture"),
+                    "created_at": now,
+                },
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
 
     def __enter__(self):
         """Context manager entry."""
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit - close connection."""
+        """Context manager exit - release connection."""
         self.close_connection()
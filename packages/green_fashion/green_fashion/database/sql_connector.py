@@ -1,12 +1,33 @@
+import asyncio
 import os
+import threading
 from contextlib import asynccontextmanager
-from typing import Any, Dict, List, Optional
+from importlib.util import find_spec
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from loguru import logger
-from sqlalchemy import text
+from sqlalchemy import inspect, make_url, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 
+# asyncmy parses rows in Cython; aiomysql (pure-Python PyMySQL) is the fallback
+_ASYNC_MYSQL_DRIVER = (
+    "mysql+asyncmy" if find_spec("asyncmy") is not None else "mysql+aiomysql"
+)
+
+# The Cloud SQL socket directory is mounted before the process starts
+_CLOUDSQL_PATH = "/cloudsql"
+_CLOUDSQL_AVAILABLE = os.path.isdir(_CLOUDSQL_PATH)
+_PREFER_UNIX_SOCKET = os.getenv("PREFER_UNIX_SOCKET", "0") == "1"
+
+# Backends whose async engines use a QueuePool that accepts sizing options;
+# others (e.g. SQLite's StaticPool/NullPool) reject them
+_QUEUE_POOL_BACKENDS = frozenset(("mysql", "mariadb", "postgresql"))
+
+# Built once; the health check runs on every load balancer probe
+_HEALTH_STMT = text("SELECT 1")
+
+
 # ---------- Helpers ----------
 def _build_traditional_mysql_url_from_env() -> str:
     """
@@ -14,11 +35,12 @@ def _build_traditional_mysql_url_from_env() -> str:
       DB_HOST, DB_PORT, DB_USERNAME/DB_USER, DB_PASSWORD, DB_NAME.
     Returns a PyMySQL URL for the sync engine.
     """
-    host = os.getenv("DB_HOST", "localhost")
-    port = int(os.getenv("DB_PORT", "3306"))
-    username = os.getenv("DB_USERNAME") or os.getenv("DB_USER")
-    password = os.getenv("DB_PASSWORD")
-    database = os.getenv("DB_NAME") or os.getenv("DATABASE_NAME")
+    env = os.environ
+    host = env.get("DB_HOST", "localhost")
+    port = int(env.get("DB_PORT", "3306"))
+    username = env.get("DB_USERNAME") or env.get("DB_USER")
+    password = env.get("DB_PASSWORD")
+    database = env.get("DB_NAME") or env.get("DATABASE_NAME")
 
     if not all([username, password, database]):
         raise ValueError(
@@ -31,94 +53,66 @@ def _build_traditional_mysql_url_from_env() -> str:
     return f"mysql+pymysql://{username}:{password}@{host}:{port}/{database}"
 
 
-def _resolve_sync_connection_string(explicit: Optional[str]) -> str:
+def _to_async_mysql_url(url: str) -> str:
+    """Switch a sync MySQL URL to the async driver; other URLs pass through."""
+    for prefix in ("mysql+pymysql://", "mysql://"):
+        if url.startswith(prefix):
+            return url.replace(prefix, f"{_ASYNC_MYSQL_DRIVER}://", 1)
+    # Already async (mysql+asyncmy / mysql+aiomysql) or another dialect
+    return url
+
+
+def _cloudsql_socket_url() -> Optional[str]:
+    """Async URL over the Cloud SQL Unix socket, or None when unavailable."""
+    env = os.environ
+    instance_connection_name = env.get("INSTANCE_CONNECTION_NAME")
+    if not (_CLOUDSQL_AVAILABLE and instance_connection_name):
+        return None
+    username = env.get("DB_USER") or env.get("DB_USERNAME")
+    password = env.get("DB_PASS") or env.get("DB_PASSWORD")
+    database = env.get("DB_NAME")
+    if not all([username, password, database]):
+        raise ValueError(
+            "Missing Cloud SQL env vars: DB_USER/DB_USERNAME, DB_PASS/DB_PASSWORD, DB_NAME"
+        )
+    socket_path = f"{_CLOUDSQL_PATH}/{instance_connection_name}"
+    return f"{_ASYNC_MYSQL_DRIVER}://{username}:{password}@/{database}?unix_socket={socket_path}"
+
+
+# Full connection URL env vars, in priority order
+_URL_ENV_VARS = ("MYSQL_CONNECTION_STRING", "DATABASE_URL", "DB_CONNECTION_STRING")
+
+
+def _resolve_async_connection_string(explicit: Optional[str]) -> str:
     """
-    Resolve the sync (sqlalchemy) connection URL:
+    Resolve the async (sqlalchemy) connection URL:
       1) explicit arg if provided
       2) env vars MYSQL_CONNECTION_STRING / DATABASE_URL / DB_CONNECTION_STRING
       3) Cloud SQL Unix socket, if present
       4) traditional host/port/user/pass
+    With PREFER_UNIX_SOCKET=1 the Cloud SQL socket is tried before the env
+    URLs, since it avoids the TCP stack. Sync MySQL URLs are switched to
+    asyncmy when installed, else aiomysql.
     """
     if explicit:
-        return explicit
-
-    # Direct env URL?
-    env_url = (
-        os.getenv("MYSQL_CONNECTION_STRING")
-        or os.getenv("DATABASE_URL")
-        or os.getenv("DB_CONNECTION_STRING")
-    )
-    if env_url:
-        return env_url
-
-    # Cloud SQL via Unix socket
-    cloudsql_path = "/cloudsql"
-    instance_connection_name = os.getenv("INSTANCE_CONNECTION_NAME")
-    if os.path.exists(cloudsql_path) and instance_connection_name:
-        username = os.getenv("DB_USER") or os.getenv("DB_USERNAME")
-        password = os.getenv("DB_PASS") or os.getenv("DB_PASSWORD")
-        database = os.getenv("DB_NAME")
-        if not all([username, password, database]):
-            raise ValueError(
-                "Missing Cloud SQL env vars: DB_USER/DB_USERNAME, DB_PASS/DB_PASSWORD, DB_NAME"
-            )
-        socket_path = f"{cloudsql_path}/{instance_connection_name}"
-        # Sync (PyMySQL) URL over Unix socket
-        return f"mysql+pymysql://{username}:{password}@/{database}?unix_socket={socket_path}"
-
-    # Traditional
-    return _build_traditional_mysql_url_from_env()
+        return _to_async_mysql_url(explicit)
 
+    if _PREFER_UNIX_SOCKET:
+        socket_url = _cloudsql_socket_url()
+        if socket_url:
+            return socket_url
 
-def _resolve_async_connection_string(explicit: Optional[str]) -> str:
-    """
-    Resolve the async (sqlalchemy) connection URL, mirroring the sync logic
-    but using aiomysql where appropriate.
-    """
-    if explicit:
-        # If caller passed a URL that already uses an async dialect, trust it.
-        if explicit.startswith("mysql+aiomysql://"):
-            return explicit
-        # Convert common sync URLs to async aiomysql for MySQL.
-        if explicit.startswith("mysql+pymysql://"):
-            return explicit.replace("mysql+pymysql://", "mysql+aiomysql://", 1)
-        if explicit.startswith("mysql://"):
-            return explicit.replace("mysql://", "mysql+aiomysql://", 1)
-        # Otherwise return as-is (may be another async dialect).
-        return explicit
-
-    env_url = (
-        os.getenv("MYSQL_CONNECTION_STRING")
-        or os.getenv("DATABASE_URL")
-        or os.getenv("DB_CONNECTION_STRING")
-    )
+    env = os.environ
+    env_url = next((env[k] for k in _URL_ENV_VARS if env.get(k)), None)
     if env_url:
-        if env_url.startswith("mysql+aiomysql://"):
-            return env_url
-        if env_url.startswith("mysql+pymysql://"):
-            return env_url.replace("mysql+pymysql://", "mysql+aiomysql://", 1)
-        if env_url.startswith("mysql://"):
-            return env_url.replace("mysql://", "mysql+aiomysql://", 1)
-        # Allow non-MySQL URLs (e.g., asyncpg) to pass through unchanged
-        return env_url
-
-    cloudsql_path = "/cloudsql"
-    instance_connection_name = os.getenv("INSTANCE_CONNECTION_NAME")
-    if os.path.exists(cloudsql_path) and instance_connection_name:
-        username = os.getenv("DB_USER") or os.getenv("DB_USERNAME")
-        password = os.getenv("DB_PASS") or os.getenv("DB_PASSWORD")
-        database = os.getenv("DB_NAME")
-        if not all([username, password, database]):
-            raise ValueError(
-                "Missing Cloud SQL env vars: DB_USER/DB_USERNAME, DB_PASS/DB_PASSWORD, DB_NAME"
-            )
-        socket_path = f"{cloudsql_path}/{instance_connection_name}"
-        # Async (aiomysql) URL over Unix socket
-        return f"mysql+aiomysql://{username}:{password}@/{database}?unix_socket={socket_path}"
+        return _to_async_mysql_url(env_url)
+
+    socket_url = _cloudsql_socket_url()
+    if socket_url:
+        return socket_url
 
     # Traditional async URL
-    sync_url = _build_traditional_mysql_url_from_env()
-    return sync_url.replace("mysql+pymysql://", "mysql+aiomysql://", 1)
+    return _to_async_mysql_url(_build_traditional_mysql_url_from_env())
 
 
 class AsyncSQLConnector:
@@ -130,14 +124,33 @@ class AsyncSQLConnector:
         self.connection_string = _resolve_async_connection_string(connection_string)
         self.engine = None
         self.SessionLocal = None
+        # Schema metadata rarely changes; cached until close()
+        self._table_names: Optional[List[str]] = None
+        self._table_columns: Dict[str, List[Dict[str, Any]]] = {}
         self._initialize_engine()
 
     def _initialize_engine(self):
         try:
+            pool_options: Dict[str, Any] = {}
+            if make_url(self.connection_string).get_backend_name() in (
+                _QUEUE_POOL_BACKENDS
+            ):
+                pool_options = dict(
+                    # Sized for concurrent Cloud Run requests; override per
+                    # deployment
+                    pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+                    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+                    pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "10")),
+                )
             self.engine = create_async_engine(
                 self.connection_string,
                 echo=False,
-                pool_pre_ping=True,
+                # Recycling below MySQL's wait_timeout keeps connections
+                # alive; a pre-ping costs a round trip on every checkout
+                pool_pre_ping=os.getenv("DB_PRE_PING", "0") == "1",
+                # Recycle before Cloud SQL / MySQL drop idle connections
+                pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+                **pool_options,
             )
             self.SessionLocal = async_sessionmaker(
                 self.engine,
@@ -167,15 +180,36 @@ class AsyncSQLConnector:
     async def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None):
         """
         Execute a SQL statement asynchronously. Returns:
-          - list[dict] for SELECT (rows)
+          - list[RowMapping] for SELECT (read-only, dict-like rows)
           - None for non-SELECT
         """
         async with self.transaction() as session:
             result = await session.execute(text(query), params or {})
             if result.returns_rows:
-                return [dict(r) for r in result.mappings().all()]
+                return result.mappings().all()
             return None
 
+    async def execute_many(
+        self, items: Sequence[Tuple[str, Optional[Dict[str, Any]]]]
+    ) -> List[Any]:
+        """
+        Execute several statements concurrently and return their results in order.
+
+        Each statement runs on its own pooled connection, so N independent
+        lookups take about as long as the slowest one instead of their sum.
+
+        Args:
+            items: (query, params) pairs
+
+        Returns:
+            List: One execute_query result per item
+        """
+        return list(
+            await asyncio.gather(
+                *(self.execute_query(query, params) for query, params in items)
+            )
+        )
+
     async def fetch_one(self, query: str, params: Optional[Dict[str, Any]] = None):
         async with self.transaction() as session:
             result = await session.execute(text(query), params or {})
@@ -185,31 +219,75 @@ class AsyncSQLConnector:
     async def test_connection(self) -> bool:
         try:
             async with self.transaction() as session:
-                await session.execute(text("SELECT 1"))
+                await session.execute(_HEALTH_STMT)
             logger.info("Async DB connection OK")
             return True
         except Exception as e:
             logger.error(f"Async DB connection failed: {e}")
             return False
 
+    async def _inspect(self, fn):
+        """Run ``fn`` against a SQLAlchemy Inspector on a pooled connection."""
+        async with self.engine.connect() as conn:
+            return await conn.run_sync(lambda sync_conn: fn(inspect(sync_conn)))
+
     async def list_tables(self) -> List[str]:
-        query = """
-        SELECT TABLE_NAME
-        FROM INFORMATION_SCHEMA.TABLES
-        WHERE TABLE_SCHEMA = DATABASE()
-        ORDER BY TABLE_NAME
-        """
-        rows = await self.execute_query(query) or []
-        return [row["TABLE_NAME"] for row in rows]
+        """Table names in the current database, cached until close()."""
+        if self._table_names is None:
+            self._table_names = await self._inspect(
+                lambda inspector: sorted(inspector.get_table_names())
+            )
+        return list(self._table_names)
+
+    async def get_table_info(self, table_name: str) -> List[Dict[str, Any]]:
+        """Column name, type, nullability and default, cached until close()."""
+        if table_name not in self._table_columns:
+            columns = await self._inspect(
+                lambda inspector: inspector.get_columns(table_name)
+            )
+            self._table_columns[table_name] = [
+                {
+                    "name": column["name"],
+                    "type": str(column["type"]),
+                    "nullable": column["nullable"],
+                    "default": column.get("default"),
+                }
+                for column in columns
+            ]
+        return [dict(column) for column in self._table_columns[table_name]]
 
     async def close(self):
+        # Later get_async_sql_connector calls build a fresh connector
+        with _CONNECTORS_LOCK:
+            if _CONNECTORS.get(self.connection_string) is self:
+                del _CONNECTORS[self.connection_string]
+        self._table_names = None
+        self._table_columns.clear()
         if self.engine:
             await self.engine.dispose()
             logger.info("Async SQL connector closed")
 
 
+# Resolved URL -> connector; one engine and pool per database per process
+_CONNECTORS: Dict[str, AsyncSQLConnector] = {}
+# Sync FastAPI dependencies resolve connectors from threadpool workers
+_CONNECTORS_LOCK = threading.Lock()
+
+
 def get_async_sql_connector(
     connection_string: Optional[str] = None,
 ) -> AsyncSQLConnector:
-    """Async connector (use this for FastAPI async routes)."""
-    return AsyncSQLConnector(connection_string)
+    """
+    Async connector (use this for FastAPI async routes).
+
+    Connectors are shared per resolved URL, so every caller reuses the same
+    engine and connection pool instead of building a new one per request.
+    """
+    url = _resolve_async_connection_string(connection_string)
+    connector = _CONNECTORS.get(url)
+    if connector is None:
+        with _CONNECTORS_LOCK:
+            connector = _CONNECTORS.get(url)
+            if connector is None:
+                connector = _CONNECTORS[url] = AsyncSQLConnector(url)
+    return connector
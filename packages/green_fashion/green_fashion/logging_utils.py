@@ -19,31 +19,66 @@ from __future__ import annotations
 import json
 import logging
 import os
+import secrets
 import sys
 import time
-import uuid
 from contextvars import ContextVar
-from typing import Any, Callable
+from typing import Any, Callable, ClassVar
 
 from loguru import logger as _logger
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
 # Context for per-request fields
 request_id_ctx: ContextVar[str | None] = ContextVar("request_id", default=None)
 user_id_ctx: ContextVar[str | None] = ContextVar("user_id", default=None)
 
+# Loguru level name -> GCP Cloud Logging severity
+_GCP_SEVERITY = {
+    "TRACE": "DEBUG",
+    "DEBUG": "DEBUG",
+    "INFO": "INFO",
+    "SUCCESS": "NOTICE",
+    "WARNING": "WARNING",
+    "ERROR": "ERROR",
+    "CRITICAL": "CRITICAL",
+}
+
 
 class InterceptHandler(logging.Handler):
     """Redirect stdlib logging records to Loguru."""
 
+    _LOGGING_FILE = logging.__file__
+    # stdlib level name -> Loguru level name (or number for unknown levels)
+    _LEVEL_CACHE: ClassVar[dict[str, str | int]] = {}
+    # Records below the sinks' level are dropped before any Loguru work;
+    # set by setup_logging
+    _min_level = 0
+
+    @classmethod
+    def _resolve_level(cls, record: logging.LogRecord) -> str | int:
+        level = cls._LEVEL_CACHE.get(record.levelname)
+        if level is None:
+            try:
+                level = _logger.level(record.levelname).name
+            except ValueError:
+                level = record.levelno
+            cls._LEVEL_CACHE[record.levelname] = level
+        return level
+
     def emit(self, record: logging.LogRecord) -> None:
-        try:
-            level = _logger.level(record.levelname).name
-        except ValueError:
-            level = record.levelno
-
-        # Find the caller from where logging was called
-        frame, depth = logging.currentframe(), 2
-        while frame and frame.f_code.co_filename == logging.__file__:
+        if record.levelno < self._min_level:
+            return
+        level = self._resolve_level(record)
+
+        # Find the caller from where logging was called; both sinks report
+        # its function and line, so the walk cannot be skipped
+        logging_file = self._LOGGING_FILE
+        frame, depth = sys._getframe(1), 1
+        while frame and frame.f_code.co_filename == logging_file:
             frame = frame.f_back
             depth += 1
 
@@ -52,26 +87,32 @@ class InterceptHandler(logging.Handler):
         ).log(level, record.getMessage())
 
 
-def _console_format() -> str:
-    # Colorized, concise format for local dev
-    return (
-        "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> "
-        "| <level>{level: <8}</level> "
-        "| <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> "
-        "| <magenta>{extra[service]}</magenta> "
-        "- <level>{message}</level>"
-    )
+# Colorized, concise format for local dev
+_CONSOLE_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> "
+    "| <level>{level: <8}</level> "
+    "| <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> "
+    "| <magenta>{extra[service]}</magenta> "
+    "- <level>{message}</level>"
+)
 
 
 def _serialize(record: dict) -> str:
-    # Ensure extras are embedded and include context variables
-    payload = dict(record)
-    payload["request_id"] = (
-        payload.get("extra", {}).get("request_id") or request_id_ctx.get()
-    )
-    payload["user_id"] = payload.get("extra", {}).get("user_id") or user_id_ctx.get()
-    # Remove non-serializable elements
-    payload.pop("exception", None)
+    # Only the fields we ship; extras embedded plus context variables
+    extra = record["extra"]
+    payload = {
+        "message": record["message"],
+        "level": record["level"].name,
+        "time": record["time"].isoformat(),
+        "name": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "extra": extra,
+        "request_id": extra.get("request_id") or request_id_ctx.get(),
+        "user_id": extra.get("user_id") or user_id_ctx.get(),
+    }
+    if orjson is not None:
+        return orjson.dumps(payload, default=str).decode()
     return json.dumps(payload, default=str)
 
 
@@ -93,7 +134,11 @@ def setup_logging(
       - LOG_FILE (path to log file, optional)
       - LOG_ROTATION (e.g., "10 MB" or "1 week")
       - LOG_RETENTION (e.g., "7 days")
-      - LOG_ENQUEUE ("1" to enable multiprocess-safety)
+      - LOG_ENQUEUE (default "1"; "0" to write logs synchronously)
+
+    With enqueue enabled, records are formatted and written by Loguru's
+    background thread (sinks included), so request handlers never block
+    on stdout or file I/O.
     """
 
     # Resolve settings with env fallbacks
@@ -106,7 +151,7 @@ def setup_logging(
     log_file = log_file or os.getenv("LOG_FILE")
     rotation = rotation or os.getenv("LOG_ROTATION", "50 MB")
     retention = retention or os.getenv("LOG_RETENTION", "14 days")
-    enqueue = enqueue if enqueue is not None else os.getenv("LOG_ENQUEUE", "0") == "1"
+    enqueue = enqueue if enqueue is not None else os.getenv("LOG_ENQUEUE", "1") == "1"
 
     # Remove default handlers
     _logger.remove()
@@ -119,19 +164,8 @@ def setup_logging(
         # Emit JSON compatible with GCP Cloud Logging expectations
         def gcp_json_sink(message):
             rec = message.record
-            lvl = rec["level"].name
-            # Map Loguru levels to GCP severities
-            severity_map = {
-                "TRACE": "DEBUG",
-                "DEBUG": "DEBUG",
-                "INFO": "INFO",
-                "SUCCESS": "NOTICE",
-                "WARNING": "WARNING",
-                "ERROR": "ERROR",
-                "CRITICAL": "CRITICAL",
-            }
             payload = {
-                "severity": severity_map.get(lvl, "INFO"),
+                "severity": _GCP_SEVERITY.get(rec["level"].name, "INFO"),
                 "message": rec["message"],
                 "service": rec["extra"].get("service"),
                 "request_id": rec["extra"].get("request_id"),
@@ -141,7 +175,13 @@ def setup_logging(
                 "line": rec["line"],
                 "time": rec["time"].isoformat(),
             }
-            sys.stdout.write(json.dumps(payload) + "\n")
+            # orjson returns bytes, written to the binary buffer without
+            # re-encoding (stdout may be replaced by a text-only stream)
+            buffer = getattr(sys.stdout, "buffer", None)
+            if orjson is not None and buffer is not None:
+                buffer.write(orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE))
+            else:
+                sys.stdout.write(json.dumps(payload) + "\n")
 
         _logger.add(
             gcp_json_sink,
@@ -154,7 +194,7 @@ def setup_logging(
         _logger.add(
             sys.stdout,
             level=level,
-            format=_console_format(),
+            format=_CONSOLE_FORMAT,
             backtrace=False,
             diagnose=False,
             enqueue=enqueue,
@@ -165,7 +205,7 @@ def setup_logging(
         _logger.add(
             log_file,
             level=level,
-            format=None if json_logs else _console_format(),
+            format=None if json_logs else _CONSOLE_FORMAT,
             serialize=json_logs,
             rotation=rotation,
             retention=retention,
@@ -173,31 +213,31 @@ def setup_logging(
         )
 
     # Intercept stdlib logging (including uvicorn, fastapi)
+    num_level = (
+        level if isinstance(level, int) else logging.getLevelName(str(level).upper())
+    )
     intercept = InterceptHandler()
-    logging.basicConfig(handlers=[intercept], level=0, force=True)
-
-    for name in (
-        "uvicorn",
-        "uvicorn.error",
-        "uvicorn.access",
-        "fastapi",
-        "asyncio",
-        "pymongo",
-        "google",
-        "PIL",
-    ):
-        logging.getLogger(name).handlers = [intercept]
-        logging.getLogger(name).propagate = False
-        logging.getLogger(name).setLevel(
-            level
-            if isinstance(level, int)
-            else logging.getLevelName(str(level).upper())
-        )
+    intercept._min_level = num_level
+    # One handler on the root logger; library loggers propagate to it and
+    # inherit its level, so filtered records are never created
+    logging.basicConfig(handlers=[intercept], level=num_level, force=True)
+
+    # uvicorn installs its own handlers with propagate=False before the app
+    # is imported; hand its loggers back to the root handler
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers = []
+        uvicorn_logger.propagate = True
+        uvicorn_logger.setLevel(logging.NOTSET)
 
     # Bind base fields
     _logger.configure(extra=base_extra)
 
 
+# Request/response line logged by request_context_middleware
+_ACCESS_LOG_FORMAT = "{method} {path} -> {status} in {duration:.1f}ms"
+
+
 async def request_context_middleware(request, call_next: Callable[[Any], Any]):
     """Starlette/FASTAPI middleware to set request_id and log request/response.
 
@@ -205,7 +245,7 @@ async def request_context_middleware(request, call_next: Callable[[Any], Any]):
     - Binds context for all logs within the request scope.
     - Logs request method, path, status, and latency.
     """
-    rid = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+    rid = request.headers.get("X-Request-ID") or secrets.token_hex(16)
     token = request_id_ctx.set(rid)
 
     start = time.perf_counter()
@@ -216,8 +256,10 @@ async def request_context_middleware(request, call_next: Callable[[Any], Any]):
     finally:
         duration_ms = (time.perf_counter() - start) * 1000
         status_code = getattr(response, "status_code", 500)
-        _logger.bind(request_id=rid).info(
-            "{method} {path} -> {status} in {duration:.1f}ms",
+        # Format kwargs also land in record["extra"], so no bind() is needed
+        _logger.info(
+            _ACCESS_LOG_FORMAT,
+            request_id=rid,
             method=request.method,
             path=request.url.path,
             status=status_code,
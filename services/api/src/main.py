@@ -1,13 +1,17 @@
+import asyncio
 import io
 import os
+import shutil
+import threading
+import time
 import urllib.request
-import uuid
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import jwt
 import uvicorn
+from bson import ObjectId
 from dotenv import load_dotenv
 from fastapi import Depends, FastAPI, File, HTTPException, Request, UploadFile
 from fastapi.exceptions import RequestValidationError
@@ -16,7 +20,6 @@ from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from google.auth.transport import requests
 from google.oauth2 import id_token
-from PIL import Image
 from pydantic import BaseModel
 from sqlalchemy import text
 
@@ -135,6 +138,18 @@ _db_manager = None
 _gcs_service = None
 _sql_connector = None
 security = HTTPBearer()
+# Per-thread google-auth transport for fetching Google's token certificates.
+# Sign-ins reuse a kept-alive TLS connection instead of opening a new one, and
+# since requests.Session is not documented as thread-safe, each threadpool
+# worker gets its own
+_google_auth_local = threading.local()
+
+
+def _get_google_auth_request() -> requests.Request:
+    request = getattr(_google_auth_local, "request", None)
+    if request is None:
+        request = _google_auth_local.request = requests.Request()
+    return request
 
 
 def initialize_services():
@@ -178,7 +193,12 @@ def initialize_services():
 
 
 def get_db_manager():
-    """Get database manager"""
+    """Get database manager
+
+    MongoDBManager uses blocking PyMongo calls, so endpoints that use it are
+    declared with plain ``def`` and run in FastAPI's threadpool instead of on
+    the event loop.
+    """
     return _db_manager
 
 
@@ -226,53 +246,145 @@ async def health_check():
     return {"status": "healthy", "database": "ready", "api": "operational"}
 
 
-@app.get("/v1/health/detailed")
-async def detailed_health_check():
-    """Detailed health check with database connectivity test"""
-    db_manager = get_db_manager()
-    sql_connector = get_sql_connector()
+# Health check result: (status contribution, response fields)
+HealthResult = Tuple[str, Dict[str, str]]
 
-    health_status = {"status": "healthy", "api": "operational"}
+# Worst status wins when combining checks
+_HEALTH_STATUS_RANK = {"healthy": 0, "starting": 1, "degraded": 2}
 
-    # Check MongoDB
-    if not db_manager or not db_manager.client:
-        health_status["mongodb"] = "connecting"
-        health_status["status"] = "starting"
-    else:
+
+class _CachedHealthCheck:
+    """Run a health check at most once per ``ttl_seconds``.
+
+    Load balancer probes and monitors then share one downstream ping per
+    window instead of each hitting the databases. Once a result is older
+    than ``ttl_seconds`` but younger than ``stale_ttl_seconds`` it is still
+    returned immediately while a background task refreshes it; only older
+    results make the caller wait for a new check. Concurrent callers share
+    one in-flight check rather than each starting their own. A check that
+    takes longer than ``timeout_seconds`` is reported as degraded with
+    ``{name: "timeout"}``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        check: Callable[[], Awaitable[HealthResult]],
+        ttl_seconds: float,
+        stale_ttl_seconds: float,
+        timeout_seconds: float = 5.0,
+    ):
+        self.name = name
+        self._check = check
+        self.timeout_seconds = timeout_seconds
+        self.ttl_seconds = ttl_seconds
+        self.stale_ttl_seconds = stale_ttl_seconds
+        self._cached: Optional[Tuple[float, HealthResult]] = None
+        # In-flight check shared by all callers; holding it also keeps a
+        # background refresh from being garbage collected mid-run
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def get(self) -> HealthResult:
+        cached = self._cached
+        if cached is not None:
+            age = time.monotonic() - cached[0]
+            if age < self.ttl_seconds:
+                return cached[1]
+            if age < self.stale_ttl_seconds:
+                self._start_refresh()
+                return cached[1]
+        # Shielded so a cancelled probe does not cancel the shared check
+        return await asyncio.shield(self._start_refresh())
+
+    def _start_refresh(self) -> asyncio.Task:
+        # No await between the check and create_task, so concurrent callers
+        # cannot start a second refresh
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+        return self._refresh_task
+
+    async def _refresh(self) -> HealthResult:
         try:
-            db_manager.client.admin.command("ping")
-            health_status["mongodb"] = "connected"
-        except Exception as e:
-            health_status["mongodb"] = "connection_error"
-            health_status["status"] = "degraded"
-            health_status["mongodb_error"] = str(e)
+            result = await asyncio.wait_for(self._check(), self.timeout_seconds)
+        except TimeoutError:
+            result = "degraded", {self.name: "timeout"}
+        self._cached = (time.monotonic(), result)
+        return result
+
 
-    # Check SQL Database
+async def _check_mongodb() -> HealthResult:
+    db_manager = get_db_manager()
+    if not db_manager or not db_manager.client:
+        return "starting", {"mongodb": "connecting"}
+    try:
+        # PyMongo blocks; keep the ping off the event loop
+        await asyncio.to_thread(db_manager.client.admin.command, "ping")
+        return "healthy", {"mongodb": "connected"}
+    except Exception as e:
+        return "degraded", {"mongodb": "connection_error", "mongodb_error": str(e)}
+
+
+async def _check_sql() -> HealthResult:
+    sql_connector = get_sql_connector()
     if not sql_connector:
-        health_status["sql"] = "not_configured"
-    else:
-        try:
-            if sql_connector.test_connection():
-                health_status["sql"] = "connected"
-            else:
-                health_status["sql"] = "connection_failed"
-                health_status["status"] = "degraded"
-        except Exception as e:
-            health_status["sql"] = "connection_error"
-            health_status["status"] = "degraded"
-            health_status["sql_error"] = str(e)
+        return "healthy", {"sql": "not_configured"}
+    try:
+        if await sql_connector.test_connection():
+            return "healthy", {"sql": "connected"}
+        return "degraded", {"sql": "connection_failed"}
+    except Exception as e:
+        return "degraded", {"sql": "connection_error", "sql_error": str(e)}
+
+
+_HEALTH_CHECK_TTL_SECONDS = float(os.getenv("HEALTH_CHECK_TTL_SECONDS", "5"))
+_HEALTH_CHECK_STALE_TTL_SECONDS = float(
+    os.getenv("HEALTH_CHECK_STALE_TTL_SECONDS", "30")
+)
+_HEALTH_CHECK_TIMEOUT_SECONDS = float(os.getenv("HEALTH_CHECK_TIMEOUT_SECONDS", "5"))
+_HEALTH_CHECKS = tuple(
+    _CachedHealthCheck(
+        name,
+        check,
+        _HEALTH_CHECK_TTL_SECONDS,
+        _HEALTH_CHECK_STALE_TTL_SECONDS,
+        _HEALTH_CHECK_TIMEOUT_SECONDS,
+    )
+    for name, check in (("mongodb", _check_mongodb), ("sql", _check_sql))
+)
+
+
+@app.get("/v1/health/detailed")
+async def detailed_health_check():
+    """Detailed health check with database connectivity test
+
+    Each check result is reused for HEALTH_CHECK_TTL_SECONDS (default 5) and
+    served while refreshing in the background until
+    HEALTH_CHECK_STALE_TTL_SECONDS (default 30).
+    """
+    health_status = {"status": "healthy", "api": "operational"}
+    results = await asyncio.gather(*(check.get() for check in _HEALTH_CHECKS))
+    for status, fields in results:
+        health_status.update(fields)
+        if _HEALTH_STATUS_RANK[status] > _HEALTH_STATUS_RANK[health_status["status"]]:
+            health_status["status"] = status
 
     return health_status
 
 
 @app.get("/v1/items", response_model=List[Dict])
-async def get_all_items(current_user_id: str = Depends(get_current_user)):
-    """Get all clothing items"""
+def get_all_items(
+    skip: int = 0,
+    limit: Optional[int] = None,
+    current_user_id: str = Depends(get_current_user),
+):
+    """Get all clothing items, or one newest-first page when limit is given"""
     logger.bind(user_id=current_user_id).info("Fetching all items")
     try:
         db_manager = get_db_manager()
         if not db_manager:
             raise HTTPException(status_code=503, detail="Database not available")
+        if limit is not None:
+            return db_manager.get_items_page(current_user_id, skip=skip, limit=limit)
         return db_manager.get_all_items(current_user_id)
     except Exception as e:
         logger.exception("Failed to get all items: {error}", error=str(e))
@@ -280,7 +392,7 @@ async def get_all_items(current_user_id: str = Depends(get_current_user)):
 
 
 @app.get("/v1/items/{item_id}")
-async def get_item(item_id: str, current_user_id: str = Depends(get_current_user)):
+def get_item(item_id: str, current_user_id: str = Depends(get_current_user)):
     """Get a specific clothing item by ID"""
     try:
         db_manager = get_db_manager()
@@ -298,9 +410,7 @@ async def get_item(item_id: str, current_user_id: str = Depends(get_current_user
 
 
 @app.post("/v1/items")
-async def create_item(
-    item: ClothingItem, current_user_id: str = Depends(get_current_user)
-):
+def create_item(item: ClothingItem, current_user_id: str = Depends(get_current_user)):
     """Create a new clothing item"""
     try:
         logger.info(f"Received item data: {item.dict()}")
@@ -330,7 +440,7 @@ async def create_item(
 
 
 @app.put("/v1/items/{item_id}")
-async def update_item(
+def update_item(
     item_id: str,
     updates: UpdateClothingItem,
     current_user_id: str = Depends(get_current_user),
@@ -366,7 +476,7 @@ async def update_item(
 
 
 @app.delete("/v1/items/{item_id}")
-async def delete_item(item_id: str, current_user_id: str = Depends(get_current_user)):
+def delete_item(item_id: str, current_user_id: str = Depends(get_current_user)):
     """Delete a clothing item"""
     try:
         db_manager = get_db_manager()
@@ -406,7 +516,7 @@ async def delete_item(item_id: str, current_user_id: str = Depends(get_current_u
 
 
 @app.get("/v1/items/category/{category}")
-async def get_items_by_category(
+def get_items_by_category(
     category: str, current_user_id: str = Depends(get_current_user)
 ):
     """Get all items in a specific category"""
@@ -426,7 +536,7 @@ async def get_items_by_category(
 
 
 @app.get("/v1/categories")
-async def get_categories(current_user_id: str = Depends(get_current_user)):
+def get_categories(current_user_id: str = Depends(get_current_user)):
     """Get all unique categories"""
     try:
         db_manager = get_db_manager()
@@ -440,7 +550,11 @@ async def get_categories(current_user_id: str = Depends(get_current_user)):
 
 
 @app.get("/v1/search")
-async def search_items(query: str, current_user_id: str = Depends(get_current_user)):
+def search_items(
+    query: str,
+    prefix: bool = False,
+    current_user_id: str = Depends(get_current_user),
+):
     """Search for items by name, category, or filename"""
     try:
         if not query.strip():
@@ -448,7 +562,7 @@ async def search_items(query: str, current_user_id: str = Depends(get_current_us
         db_manager = get_db_manager()
         if not db_manager:
             raise HTTPException(status_code=503, detail="Database not available")
-        items = db_manager.search_items(query, current_user_id)
+        items = db_manager.search_items(query, current_user_id, prefix=prefix)
         return items
     except Exception as e:
         logger.exception(
@@ -458,22 +572,24 @@ async def search_items(query: str, current_user_id: str = Depends(get_current_us
 
 
 @app.get("/v1/stats")
-async def get_stats(current_user_id: str = Depends(get_current_user)):
+def get_stats(current_user_id: str = Depends(get_current_user)):
     """Get wardrobe statistics"""
     try:
         db_manager = get_db_manager()
         if not db_manager:
             raise HTTPException(status_code=503, detail="Database not available")
-        total_items = db_manager.get_item_count(current_user_id)
-        category_counts = db_manager.get_category_counts(current_user_id)
-        return {"total_items": total_items, "category_counts": category_counts}
+        stats = db_manager.get_stats(current_user_id)
+        return {
+            "total_items": stats["total"],
+            "category_counts": stats["category_counts"],
+        }
     except Exception as e:
         logger.exception("Failed to get stats: {error}", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/v1/items/{item_id}/upload-image")
-async def upload_image(
+def upload_image(
     item_id: str,
     file: UploadFile = File(...),
     current_user_id: str = Depends(get_current_user),
@@ -492,8 +608,9 @@ async def upload_image(
         if not file.content_type.startswith("image/"):
             raise HTTPException(status_code=400, detail="File must be an image")
 
-        # Generate unique ID for the filename to hide original name
-        unique_id = str(uuid.uuid4())
+        # Generate unique ID for the filename to hide original name; ObjectIds
+        # are time-prefixed, so new uploads sort together in the bucket
+        unique_id = str(ObjectId())
         logger.debug(
             "Attempting to save image with id: {unique_id}", unique_id=unique_id
         )
@@ -537,25 +654,29 @@ async def upload_image(
 
 
 @app.post("/v1/extract-colors", response_model=ColorExtractionResponse)
-async def extract_colors(
+def extract_colors(
     file: UploadFile = File(...),
     current_user_id: str = Depends(get_current_user),
 ):
-    """Extract color palette from an uploaded image"""
+    """Extract color palette from an uploaded image
+
+    Plain ``def`` so the file copy and the CPU-bound extraction run in the
+    threadpool instead of blocking the event loop.
+    """
     try:
         # Validate file type
         if not file.content_type.startswith("image/"):
             raise HTTPException(status_code=400, detail="File must be an image")
 
-        # Create PIL Image from uploaded file
-        image_data = await file.read()
-        image = Image.open(io.BytesIO(image_data))
-
-        # Save temporarily to extract colors (the function expects a file path)
-        temp_path = f"/tmp/{uuid.uuid4()}.jpg"
-        image.save(temp_path)
+        # Save temporarily to extract colors (the function expects a file path).
+        # The upload is streamed in chunks instead of being read, decoded and
+        # re-encoded in memory.
+        temp_path = f"/tmp/{ObjectId()}"
 
         try:
+            with open(temp_path, "wb") as temp_file:
+                shutil.copyfileobj(file.file, temp_file, length=1024 * 1024)
+
             # Extract color palette
             palette = extract_color_palette(temp_path)
 
@@ -569,8 +690,10 @@ async def extract_colors(
 
         finally:
             # Clean up temporary file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+            try:
+                os.unlink(temp_path)
+            except FileNotFoundError:
+                pass
 
     except HTTPException:
         raise
@@ -581,14 +704,14 @@ async def extract_colors(
 
 
 @app.post("/v1/auth/google", response_model=AuthResponse)
-async def google_auth(auth_request: GoogleAuthRequest):
+def google_auth(auth_request: GoogleAuthRequest):
     try:
         db_manager = get_db_manager()
         if not db_manager:
             raise HTTPException(status_code=503, detail="Database not available")
 
         idinfo = id_token.verify_oauth2_token(
-            auth_request.token, requests.Request(), GOOGLE_CLIENT_ID
+            auth_request.token, _get_google_auth_request(), GOOGLE_CLIENT_ID
         )
 
         if idinfo["iss"] not in ["accounts.google.com", "https://accounts.google.com"]:
@@ -644,7 +767,7 @@ async def google_auth_v2(
 ) -> AuthResponse:
     try:
         idinfo = id_token.verify_oauth2_token(
-            auth_request.token, requests.Request(), GOOGLE_CLIENT_ID
+            auth_request.token, _get_google_auth_request(), GOOGLE_CLIENT_ID
         )
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid Google token")
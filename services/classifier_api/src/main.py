@@ -90,7 +90,7 @@ def get_cached_model():
 
 @app.post("/classify")
 async def classify_item(file: UploadFile = File(...)):
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     try:
         model, processor, device = get_cached_model()
@@ -133,7 +133,7 @@ async def classify_item(file: UploadFile = File(...)):
             # Sort by confidence and return the highest
             results.sort(key=lambda x: x["confidence"], reverse=True)
 
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
             logger.info(
                 "Classification completed in {elapsed:.3f}s", elapsed=processing_time
             )